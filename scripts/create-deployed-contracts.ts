@@ -67,35 +67,36 @@ function findLatestDeployment(): string | null {
   }
 }
 
-function extractContractAddresses(
-  deploymentFile: string
-): Record<string, string> {
+function readDeployment(deploymentFile: string): DeploymentData {
   try {
-    const data: DeploymentData = JSON.parse(
-      readFileSync(deploymentFile, "utf-8")
-    );
-    const contracts: Record<string, string> = {};
-
-    // Parse transactions to find contract deployments
-    for (const tx of data.transactions || []) {
-      const contractName = tx.contractName;
-      const contractAddress = tx.contractAddress;
-
-      if (contractName && contractAddress) {
-        // Convert to checksummed address for web3/viem compatibility
-        const checksummedAddress = getAddress(contractAddress);
-        contracts[contractName] = checksummedAddress;
-        console.log(`   Found ${contractName}: ${checksummedAddress}`);
-      }
-    }
-
-    return contracts;
+    return JSON.parse(readFileSync(deploymentFile, "utf-8"));
   } catch (error) {
     console.error(`❌ Error reading deployment file: ${error}`);
     throw error;
   }
 }
 
+function extractContractAddresses(
+  data: DeploymentData
+): Record<string, string> {
+  const contracts: Record<string, string> = {};
+
+  // Parse transactions to find contract deployments
+  for (const tx of data.transactions || []) {
+    const contractName = tx.contractName;
+    const contractAddress = tx.contractAddress;
+
+    if (contractName && contractAddress) {
+      // Convert to checksummed address for web3/viem compatibility
+      const checksummedAddress = getAddress(contractAddress);
+      contracts[contractName] = checksummedAddress;
+      console.log(`   Found ${contractName}: ${checksummedAddress}`);
+    }
+  }
+
+  return contracts;
+}
+
 function createDeployedContractsFile(
   contracts: Record<string, string>,
   chainId: number
@@ -168,13 +169,13 @@ function main(): void {
     process.exit(1);
   }
 
+  // Parse the deployment file once for both addresses and chain ID
+  const deploymentData = readDeployment(deploymentFile);
+
   // Extract contract addresses
-  const contracts = extractContractAddresses(deploymentFile);
+  const contracts = extractContractAddresses(deploymentData);
 
   // Get chain ID from deployment file
-  const deploymentData: DeploymentData = JSON.parse(
-    readFileSync(deploymentFile, "utf-8")
-  );
   const chainId = deploymentData.chain || 31337;
 
   // Create deployed_contracts.json
@@ -193,6 +194,7 @@ if (require.main === module) {
 
 export {
   findLatestDeployment,
+  readDeployment,
   extractContractAddresses,
   createDeployedContractsFile,
 };
@@ -0,0 +1,53 @@
+#!/usr/bin/env node
+
+/**
+ * Generate and verify a test proof for the rebalancer circuit
+ * Runs witness calculation, proving and verification in a single process so
+ * the bn128 curve (and its worker threads) is built once instead of per step
+ */
+
+const fs = require("fs");
+const snarkjs = require("snarkjs");
+
+const BUILD_DIR = "build/rebalancer-validation";
+const WASM_PATH = `${BUILD_DIR}/rebalancer-validation_js/rebalancer-validation.wasm`;
+const ZKEY_PATH = `${BUILD_DIR}/rebalancer_validation_final.zkey`;
+const VKEY_PATH = `${BUILD_DIR}/verification_key.json`;
+const INPUT_PATH = "input/rebalancer-input.json";
+const WITNESS_PATH = `${BUILD_DIR}/witness.wtns`;
+const PROOF_PATH = `${BUILD_DIR}/proof.json`;
+const PUBLIC_PATH = `${BUILD_DIR}/public.json`;
+
+async function main() {
+  const input = JSON.parse(fs.readFileSync(INPUT_PATH, "utf-8"));
+
+  // Keep the witness in memory and hand it straight to the prover; the
+  // .wtns file is only written out as a build artifact
+  const witness = { type: "mem" };
+  await snarkjs.wtns.calculate(input, WASM_PATH, witness);
+  fs.writeFileSync(WITNESS_PATH, witness.data);
+  console.log("✅ Test witness is valid");
+
+  const { proof, publicSignals } = await snarkjs.groth16.prove(
+    ZKEY_PATH,
+    witness
+  );
+  fs.writeFileSync(PROOF_PATH, JSON.stringify(proof, null, 1));
+  fs.writeFileSync(PUBLIC_PATH, JSON.stringify(publicSignals, null, 1));
+  console.log("✅ Test proof generated");
+
+  const vKey = JSON.parse(fs.readFileSync(VKEY_PATH, "utf-8"));
+  const isValid = await snarkjs.groth16.verify(vKey, publicSignals, proof);
+  if (!isValid) {
+    console.error("❌ Test proof failed verification");
+    process.exit(1);
+  }
+  console.log("✅ Test proof verified successfully!");
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error("❌ Error:", error);
+    process.exit(1);
+  });
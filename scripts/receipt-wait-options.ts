@@ -0,0 +1,37 @@
+/**
+ * Receipt wait settings shared by the agent management scripts
+ *
+ * Optional environment variables:
+ *   RECEIPT_POLL_INTERVAL_MS - Receipt polling interval (defaults based on chain block time)
+ *   RECEIPT_TIMEOUT_MS - Max time to wait for confirmation (defaults to viem's timeout)
+ *
+ * Call after dotenv.config() and before sending any transaction, so a bad
+ * value stops the script instead of failing after the tx is broadcast.
+ */
+
+function readPositiveMs(name: string): number | undefined {
+  const raw = process.env[name];
+  if (raw === undefined || raw.trim() === "") {
+    return undefined;
+  }
+
+  const value = Number(raw);
+  if (!Number.isFinite(value) || value <= 0) {
+    console.error(
+      `❌ Error: ${name} must be a positive number of milliseconds (got "${raw}")`
+    );
+    process.exit(1);
+  }
+  return value;
+}
+
+// Unset values stay undefined so viem keeps its own defaults
+export function getReceiptWaitOptions(): {
+  pollingInterval?: number;
+  timeout?: number;
+} {
+  return {
+    pollingInterval: readPositiveMs("RECEIPT_POLL_INTERVAL_MS"),
+    timeout: readPositiveMs("RECEIPT_TIMEOUT_MS"),
+  };
+}
@@ -15,15 +15,29 @@ import { sepolia } from "viem/chains";
 import * as fs from "fs";
 import * as path from "path";
 import * as dotenv from "dotenv";
+import { getReceiptWaitOptions } from "./receipt-wait-options";
 
 // Load environment variables
 dotenv.config();
 
+// Validated up front, before any transaction is sent
+const RECEIPT_WAIT_OPTIONS = getReceiptWaitOptions();
+
 // Configuration
 const RPC_URL_SEPOLIA =
   process.env.RPC_URL_SEPOLIA || "https://sepolia.drpc.org";
 const IDENTITY_REGISTRY_ADDRESS =
   "0x8004A818BFB912233c491871b3d84c89A494BD9e" as const;
+const IDENTITY_REGISTRY_ADDRESS_LOWER = IDENTITY_REGISTRY_ADDRESS.toLowerCase();
+
+// CAIP-10 style registry reference (eip155:{chainId}:{registry}), built once
+const AGENT_REGISTRY_REF = `eip155:${sepolia.id}:${IDENTITY_REGISTRY_ADDRESS}`;
+
+// Log topics used to find the mint in the registration receipt
+const TRANSFER_EVENT_TOPIC =
+  "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"; // Transfer(address,address,uint256)
+const ZERO_ADDRESS_TOPIC =
+  "0x0000000000000000000000000000000000000000000000000000000000000000"; // from address(0)
 
 // IPFS CID from environment or from latest-ipfs-cid.txt file
 const getIPFSCID = (): string => {
@@ -152,6 +166,7 @@ async function main() {
     const receipt = await publicClient.waitForTransactionReceipt({
       hash,
       confirmations: 1,
+      ...RECEIPT_WAIT_OPTIONS,
     });
 
     if (receipt.status === "success") {
@@ -160,34 +175,35 @@ async function main() {
       // Extract agentId from Transfer event (minting from address(0))
       const transferLog = receipt.logs.find(
         (log: any) =>
-          log.address.toLowerCase() ===
-            IDENTITY_REGISTRY_ADDRESS.toLowerCase() &&
-          log.topics[0] ===
-            "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef" && // Transfer event signature
-          log.topics[1] ===
-            "0x0000000000000000000000000000000000000000000000000000000000000000" // from address(0)
+          log.topics[0] === TRANSFER_EVENT_TOPIC &&
+          log.topics[1] === ZERO_ADDRESS_TOPIC &&
+          log.address.toLowerCase() === IDENTITY_REGISTRY_ADDRESS_LOWER
       );
 
       if (transferLog && transferLog.topics[3]) {
         const agentId = parseInt(transferLog.topics[3], 16);
         console.log(`🎫 Agent ID: ${agentId}`);
         console.log(
-          `🆔 Full Agent Reference: eip155:11155111:0x8004A818BFB912233c491871b3d84c89A494BD9e:${agentId}\n`
+          `🆔 Full Agent Reference: ${AGENT_REGISTRY_REF}:${agentId}\n`
         );
 
-        // Verify registration
-        const registeredTokenURI = await publicClient.readContract({
-          address: IDENTITY_REGISTRY_ADDRESS,
-          abi: IDENTITY_REGISTRY_ABI,
-          functionName: "tokenURI",
-          args: [BigInt(agentId)],
-        });
-
-        const owner = await publicClient.readContract({
-          address: IDENTITY_REGISTRY_ADDRESS,
-          abi: IDENTITY_REGISTRY_ABI,
-          functionName: "ownerOf",
-          args: [BigInt(agentId)],
+        // Verify registration (both reads in a single Multicall3 eth_call)
+        const [registeredTokenURI, owner] = await publicClient.multicall({
+          allowFailure: false,
+          contracts: [
+            {
+              address: IDENTITY_REGISTRY_ADDRESS,
+              abi: IDENTITY_REGISTRY_ABI,
+              functionName: "tokenURI",
+              args: [BigInt(agentId)],
+            },
+            {
+              address: IDENTITY_REGISTRY_ADDRESS,
+              abi: IDENTITY_REGISTRY_ABI,
+              functionName: "ownerOf",
+              args: [BigInt(agentId)],
+            },
+          ],
         });
 
         console.log(`✅ Verification:`);
@@ -208,14 +224,26 @@ async function main() {
           `✅ Updated agent-card-zyfai.json with agentId: ${agentId}\n`
         );
 
-        // Save agent ID to file for convenience
+        // Save agent ID to file for convenience, keyed by chain and registry
+        // so set-agent-uri.ts only reuses it for this exact deployment
         const agentIdFilePath = path.join(
           __dirname,
           "..",
-          "latest-agent-id.txt"
+          "latest-agent-id.json"
+        );
+        fs.writeFileSync(
+          agentIdFilePath,
+          JSON.stringify(
+            {
+              chainId: sepolia.id,
+              registry: IDENTITY_REGISTRY_ADDRESS,
+              agentId: agentId.toString(),
+            },
+            null,
+            2
+          )
         );
-        fs.writeFileSync(agentIdFilePath, agentId.toString());
-        console.log(`💾 Agent ID saved to: latest-agent-id.txt\n`);
+        console.log(`💾 Agent ID saved to: latest-agent-id.json\n`);
 
         console.log("🎉 Registration complete!");
         console.log("\n📋 Next Steps:");
@@ -5,13 +5,16 @@
  * Required environment variables:
  *   PRIVATE_KEY - Private key of the agent owner
  *   IPFS_CID - IPFS CID of the agent card JSON
- *   AGENT_ID - Agent ID (tokenId) to update
+ *   AGENT_ID - Agent ID (tokenId) to update (falls back to latest-agent-id.json when
+ *              it was saved for the same CHAIN_ID and IDENTITY_REGISTRY_ADDRESS)
  *   IDENTITY_REGISTRY_ADDRESS - Address of the IdentityRegistry contract
  *   CHAIN_ID - Chain ID (e.g., 11155111 for Ethereum Sepolia, 84532 for Base Sepolia)
  *
  * Optional environment variables:
  *   RPC_URL - Custom RPC URL (defaults based on chain)
  *   EXPLORER_URL - Custom explorer URL (defaults based on chain)
+ *   RECEIPT_POLL_INTERVAL_MS - Receipt polling interval (defaults based on chain block time)
+ *   RECEIPT_TIMEOUT_MS - Max time to wait for confirmation (defaults to viem's timeout)
  *
  * Usage:
  *   PRIVATE_KEY=0x... IPFS_CID=bafk... AGENT_ID=323 IDENTITY_REGISTRY_ADDRESS=0x... CHAIN_ID=11155111 npx ts-node scripts/set-agent-uri.ts
@@ -23,10 +26,16 @@ import { createWalletClient, createPublicClient, http, parseAbi, Chain } from "v
 import { privateKeyToAccount } from "viem/accounts";
 import { sepolia, baseSepolia, mainnet, base } from "viem/chains";
 import * as dotenv from "dotenv";
+import * as fs from "fs";
+import * as path from "path";
+import { getReceiptWaitOptions } from "./receipt-wait-options";
 
 // Load environment variables
 dotenv.config();
 
+// Validated up front, before any transaction is sent
+const RECEIPT_WAIT_OPTIONS = getReceiptWaitOptions();
+
 // Chain configurations
 const CHAIN_CONFIGS: Record<number, { chain: Chain; defaultRpc: string; defaultExplorer: string; name: string }> = {
   1: {
@@ -55,6 +64,40 @@ const CHAIN_CONFIGS: Record<number, { chain: Chain; defaultRpc: string; defaultE
   },
 };
 
+// Agent ID from environment, or from latest-agent-id.json (saved by register-agent-sepolia.ts)
+// when that record was written for the same chain and registry
+const getAgentId = (
+  chainId: number,
+  identityRegistryAddress: string
+): string | undefined => {
+  if (process.env.AGENT_ID) {
+    return process.env.AGENT_ID;
+  }
+
+  const agentIdFilePath = path.join(__dirname, "..", "latest-agent-id.json");
+  if (!fs.existsSync(agentIdFilePath)) {
+    return undefined;
+  }
+
+  try {
+    const record = JSON.parse(fs.readFileSync(agentIdFilePath, "utf-8"));
+    if (
+      record.chainId === chainId &&
+      typeof record.registry === "string" &&
+      record.registry.toLowerCase() === identityRegistryAddress.toLowerCase() &&
+      record.agentId
+    ) {
+      console.log(`📌 Using AGENT_ID from latest-agent-id.json: ${record.agentId}\n`);
+      return String(record.agentId);
+    }
+    console.log("ℹ️  latest-agent-id.json is for a different chain or registry, ignoring it\n");
+  } catch (error) {
+    console.warn(`⚠️  Could not read latest-agent-id.json: ${error}\n`);
+  }
+
+  return undefined;
+};
+
 // Identity Registry ABI (minimal - just what we need)
 const IDENTITY_REGISTRY_ABI = parseAbi([
   "function setAgentURI(uint256 agentId, string calldata newURI) external",
@@ -78,13 +121,6 @@ async function main() {
     process.exit(1);
   }
 
-  const agentIdStr = process.env.AGENT_ID;
-  if (!agentIdStr) {
-    console.error("❌ Error: AGENT_ID environment variable not set");
-    process.exit(1);
-  }
-  const agentId = BigInt(agentIdStr);
-
   const identityRegistryAddress = process.env.IDENTITY_REGISTRY_ADDRESS;
   if (!identityRegistryAddress) {
     console.error("❌ Error: IDENTITY_REGISTRY_ADDRESS environment variable not set");
@@ -112,6 +148,13 @@ async function main() {
     process.exit(1);
   }
 
+  const agentIdStr = getAgentId(chainId, identityRegistryAddress);
+  if (!agentIdStr) {
+    console.error("❌ Error: AGENT_ID environment variable not set");
+    process.exit(1);
+  }
+  const agentId = BigInt(agentIdStr);
+
   const rpcUrl = process.env.RPC_URL || chainConfig.defaultRpc;
   const explorerUrl = process.env.EXPLORER_URL || chainConfig.defaultExplorer;
 
@@ -126,7 +169,8 @@ async function main() {
   // Create clients
   const publicClient = createPublicClient({
     chain: chainConfig.chain,
-    transport: http(rpcUrl),
+    // Concurrent reads are sent as a single JSON-RPC batch request
+    transport: http(rpcUrl, { batch: true }),
   });
 
   const walletClient = createWalletClient({
@@ -153,12 +197,21 @@ async function main() {
   // Verify ownership before proceeding
   console.log("🔍 Verifying ownership...");
   try {
-    const owner = await publicClient.readContract({
-      address: identityRegistryAddress as `0x${string}`,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "ownerOf",
-      args: [agentId],
-    });
+    // Fetch owner and current URI in one round-trip
+    const [owner, currentURI] = await Promise.all([
+      publicClient.readContract({
+        address: identityRegistryAddress as `0x${string}`,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "ownerOf",
+        args: [agentId],
+      }),
+      publicClient.readContract({
+        address: identityRegistryAddress as `0x${string}`,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "tokenURI",
+        args: [agentId],
+      }),
+    ]);
 
     console.log(`   Owner: ${owner}`);
 
@@ -177,13 +230,6 @@ async function main() {
     console.log("✅ Ownership verified\n");
 
     // Check current URI
-    const currentURI = await publicClient.readContract({
-      address: identityRegistryAddress as `0x${string}`,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "tokenURI",
-      args: [agentId],
-    });
-
     console.log(`📄 Current URI: ${currentURI}`);
     if (currentURI === newURI) {
       console.log("\n⚠️  Warning: URI is already set to this value");
@@ -218,6 +264,7 @@ async function main() {
     const receipt = await publicClient.waitForTransactionReceipt({
       hash,
       confirmations: 1,
+      ...RECEIPT_WAIT_OPTIONS,
     });
 
     if (receipt.status === "success") {
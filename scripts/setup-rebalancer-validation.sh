@@ -49,7 +49,9 @@ mkdir -p build/rebalancer-validation
 
 echo ""
 echo "1️⃣  Compiling circuit..."
+# --O2 applies full linear simplification, so the prover has fewer constraints
 $CIRCOM_CMD circuits/rebalancer-validation.circom \
+  --O2 \
   --r1cs \
   --wasm \
   --sym \
@@ -126,34 +128,10 @@ mv "$TEMP_VERIFIER" contracts/src/RebalancerVerifier.sol
 echo -e "${GREEN}✅ Solidity verifier generated as RebalancerVerifier${NC}"
 
 echo ""
-echo "7️⃣  Testing with example input..."
+echo "7️⃣  Testing with example input (witness, proof, verification)..."
 
-# Create test witness
-node build/rebalancer-validation/rebalancer-validation_js/generate_witness.js \
-  build/rebalancer-validation/rebalancer-validation_js/rebalancer-validation.wasm \
-  input/rebalancer-input.json \
-  build/rebalancer-validation/witness.wtns
-
-echo -e "${GREEN}✅ Test witness is valid${NC}"
-
-echo ""
-echo "8️⃣  Generating test proof..."
-snarkjs g16p \
-  build/rebalancer-validation/rebalancer_validation_final.zkey \
-  build/rebalancer-validation/witness.wtns \
-  build/rebalancer-validation/proof.json \
-  build/rebalancer-validation/public.json
-
-echo -e "${GREEN}✅ Test proof generated${NC}"
-
-echo ""
-echo "9️⃣  Verifying test proof..."
-snarkjs g16v \
-  build/rebalancer-validation/verification_key.json \
-  build/rebalancer-validation/public.json \
-  build/rebalancer-validation/proof.json
-
-echo -e "${GREEN}✅ Test proof verified successfully!${NC}"
+# Single Node process for all three steps so the curve is only initialised once
+node scripts/prove-test-input.js
 
 echo ""
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
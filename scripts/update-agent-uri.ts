@@ -10,10 +10,14 @@ import { createWalletClient, createPublicClient, http, parseAbi } from "viem";
 import { privateKeyToAccount } from "viem/accounts";
 import { sepolia } from "viem/chains";
 import * as dotenv from "dotenv";
+import { getReceiptWaitOptions } from "./receipt-wait-options";
 
 // Load environment variables
 dotenv.config();
 
+// Validated up front, before any transaction is sent
+const RECEIPT_WAIT_OPTIONS = getReceiptWaitOptions();
+
 const RPC_URL_SEPOLIA =
   process.env.RPC_URL_SEPOLIA || "https://sepolia.drpc.org";
 const IDENTITY_REGISTRY_ADDRESS =
@@ -61,7 +65,8 @@ async function main() {
 
   const publicClient = createPublicClient({
     chain: sepolia,
-    transport: http(RPC_URL_SEPOLIA),
+    // Concurrent reads are sent as a single JSON-RPC batch request
+    transport: http(RPC_URL_SEPOLIA, { batch: true }),
   });
 
   const walletClient = createWalletClient({
@@ -72,12 +77,21 @@ async function main() {
 
   // Verify ownership
   try {
-    const owner = await publicClient.readContract({
-      address: IDENTITY_REGISTRY_ADDRESS,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "ownerOf",
-      args: [agentId],
-    });
+    // Fetch owner and current URI in one round-trip
+    const [owner, currentURI] = await Promise.all([
+      publicClient.readContract({
+        address: IDENTITY_REGISTRY_ADDRESS,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "ownerOf",
+        args: [agentId],
+      }),
+      publicClient.readContract({
+        address: IDENTITY_REGISTRY_ADDRESS,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "tokenURI",
+        args: [agentId],
+      }),
+    ]);
 
     if (owner.toLowerCase() !== account.address.toLowerCase()) {
       console.error(`❌ Error: You don't own this agent`);
@@ -88,14 +102,6 @@ async function main() {
 
     console.log(`✅ Ownership verified\n`);
 
-    // Get current URI
-    const currentURI = await publicClient.readContract({
-      address: IDENTITY_REGISTRY_ADDRESS,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "tokenURI",
-      args: [agentId],
-    });
-
     console.log(`📋 Current URI: ${currentURI}`);
     console.log(`📝 New URI: ${newTokenURI}\n`);
 
@@ -123,6 +129,7 @@ async function main() {
     const receipt = await publicClient.waitForTransactionReceipt({
       hash,
       confirmations: 1,
+      ...RECEIPT_WAIT_OPTIONS,
     });
 
     if (receipt.status === "success") {
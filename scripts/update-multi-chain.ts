@@ -12,10 +12,14 @@ import { sepolia, baseSepolia } from "viem/chains";
 import * as fs from "fs";
 import * as path from "path";
 import * as dotenv from "dotenv";
+import { getReceiptWaitOptions } from "./receipt-wait-options";
 
 // Load environment variables
 dotenv.config();
 
+// Validated up front, before any transaction is sent
+const RECEIPT_WAIT_OPTIONS = getReceiptWaitOptions();
+
 // Network configurations
 const NETWORKS = {
   ETHEREUM_SEPOLIA: {
@@ -36,6 +40,12 @@ const NETWORKS = {
   },
 };
 
+// Full ERC-8004 agent reference, built from the same config the update uses
+const agentReference = (networkKey: keyof typeof NETWORKS): string => {
+  const network = NETWORKS[networkKey];
+  return `eip155:${network.chain.id}:${network.identityRegistry}:${network.agentId}`;
+};
+
 const IDENTITY_REGISTRY_ABI = parseAbi([
   "function setAgentUri(uint256 agentId, string calldata newUri) external",
   "function tokenURI(uint256 tokenId) external view returns (string memory)",
@@ -50,25 +60,46 @@ async function updateURIOnChain(
   const network = NETWORKS[networkKey];
   const newTokenURI = `ipfs://${newCid}`;
 
-  console.log(`\n${"=".repeat(60)}`);
-  console.log(`🔄 Updating ${network.name}`);
-  console.log(`${"=".repeat(60)}`);
-  console.log(`🎫 Agent ID: ${network.agentId}`);
-  console.log(`📝 New URI: ${newTokenURI}`);
-  console.log(`🌐 Gateway: https://ipfs.io/ipfs/${newCid}\n`);
+  // Chains are updated concurrently, so tag every line with its network
+  const prefix = `[${network.name}]`;
+  const tagLines = (message: string) =>
+    message
+      .split("\n")
+      .map((line) => (line ? `${prefix} ${line}` : line))
+      .join("\n");
+  const log = (message: string, ...rest: unknown[]) =>
+    console.log(tagLines(message), ...rest);
+  const logError = (message: string, ...rest: unknown[]) =>
+    console.error(tagLines(message), ...rest);
+
+  // Validate inputs before spending any RPC calls on this network
+  if (network.agentId < 0) {
+    logError(
+      `❌ Error: No agent ID configured for ${network.name}. Set agentId in NETWORKS`
+    );
+    return false;
+  }
+
+  log(`\n${"=".repeat(60)}`);
+  log(`🔄 Updating ${network.name}`);
+  log(`${"=".repeat(60)}`);
+  log(`🎫 Agent ID: ${network.agentId}`);
+  log(`📝 New URI: ${newTokenURI}`);
+  log(`🌐 Gateway: https://ipfs.io/ipfs/${newCid}\n`);
 
   const privateKey = process.env.PRIVATE_KEY;
   if (!privateKey) {
-    console.error("❌ Error: PRIVATE_KEY environment variable not set");
+    logError("❌ Error: PRIVATE_KEY environment variable not set");
     return false;
   }
 
   const account = privateKeyToAccount(privateKey as `0x${string}`);
-  console.log(`📍 Updating from address: ${account.address}\n`);
+  log(`📍 Updating from address: ${account.address}\n`);
 
   const publicClient = createPublicClient({
     chain: network.chain,
-    transport: http(network.rpc),
+    // Concurrent reads are sent as a single JSON-RPC batch request
+    transport: http(network.rpc, { batch: true }),
   });
 
   const walletClient = createWalletClient({
@@ -78,41 +109,41 @@ async function updateURIOnChain(
   });
 
   try {
-    // Verify ownership
-    const owner = await publicClient.readContract({
-      address: network.identityRegistry,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "ownerOf",
-      args: [BigInt(network.agentId)],
-    });
+    // Verify ownership (owner and current URI fetched in one round-trip)
+    const [owner, currentURI] = await Promise.all([
+      publicClient.readContract({
+        address: network.identityRegistry,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "ownerOf",
+        args: [BigInt(network.agentId)],
+      }),
+      publicClient.readContract({
+        address: network.identityRegistry,
+        abi: IDENTITY_REGISTRY_ABI,
+        functionName: "tokenURI",
+        args: [BigInt(network.agentId)],
+      }),
+    ]);
 
     if (owner.toLowerCase() !== account.address.toLowerCase()) {
-      console.error(`❌ Error: You don't own this agent`);
-      console.log(`   Owner: ${owner}`);
-      console.log(`   Your address: ${account.address}`);
+      logError(`❌ Error: You don't own this agent`);
+      log(`   Owner: ${owner}`);
+      log(`   Your address: ${account.address}`);
       return false;
     }
 
-    console.log(`✅ Ownership verified\n`);
+    log(`✅ Ownership verified\n`);
 
-    // Get current URI
-    const currentURI = await publicClient.readContract({
-      address: network.identityRegistry,
-      abi: IDENTITY_REGISTRY_ABI,
-      functionName: "tokenURI",
-      args: [BigInt(network.agentId)],
-    });
-
-    console.log(`📋 Current URI: ${currentURI}`);
-    console.log(`📝 New URI: ${newTokenURI}\n`);
+    log(`📋 Current URI: ${currentURI}`);
+    log(`📝 New URI: ${newTokenURI}\n`);
 
     if (currentURI === newTokenURI) {
-      console.log("ℹ️  URI is already up to date. Skipping.\n");
+      log("ℹ️  URI is already up to date. Skipping.\n");
       return true;
     }
 
     // Update URI
-    console.log("📤 Submitting update transaction...\n");
+    log("📤 Submitting update transaction...\n");
 
     const hash = await walletClient.writeContract({
       address: network.identityRegistry,
@@ -121,19 +152,20 @@ async function updateURIOnChain(
       args: [BigInt(network.agentId), newTokenURI],
     });
 
-    console.log(`✅ Transaction submitted!`);
-    console.log(`🔗 Tx Hash: ${hash}`);
-    console.log(`🔍 Explorer: ${network.explorer}/tx/${hash}\n`);
+    log(`✅ Transaction submitted!`);
+    log(`🔗 Tx Hash: ${hash}`);
+    log(`🔍 Explorer: ${network.explorer}/tx/${hash}\n`);
 
-    console.log("⏳ Waiting for confirmation...\n");
+    log("⏳ Waiting for confirmation...\n");
 
     const receipt = await publicClient.waitForTransactionReceipt({
       hash,
       confirmations: 1,
+      ...RECEIPT_WAIT_OPTIONS,
     });
 
     if (receipt.status === "success") {
-      console.log("✅ URI updated successfully!\n");
+      log("✅ URI updated successfully!\n");
 
       // Verify update
       const updatedURI = await publicClient.readContract({
@@ -143,31 +175,31 @@ async function updateURIOnChain(
         args: [BigInt(network.agentId)],
       });
 
-      console.log(`✅ Verification:`);
-      console.log(`   Updated URI: ${updatedURI}`);
-      console.log(
+      log(`✅ Verification:`);
+      log(`   Updated URI: ${updatedURI}`);
+      log(
         `   Matches expected: ${updatedURI === newTokenURI ? "✅" : "❌"}\n`
       );
 
-      console.log("🔗 Quick Links:");
-      console.log(
+      log("🔗 Quick Links:");
+      log(
         `   Agent NFT: ${network.explorer}/token/${network.identityRegistry}?a=${network.agentId}`
       );
-      console.log(`   IPFS Card: https://ipfs.io/ipfs/${newCid}`);
-      console.log(`   Transaction: ${network.explorer}/tx/${hash}\n`);
+      log(`   IPFS Card: https://ipfs.io/ipfs/${newCid}`);
+      log(`   Transaction: ${network.explorer}/tx/${hash}\n`);
 
       return true;
     } else {
-      console.error("❌ Transaction failed!");
-      console.log(`Receipt:`, receipt);
+      logError("❌ Transaction failed!");
+      log(`Receipt:`, receipt);
       return false;
     }
   } catch (error: any) {
-    console.error("\n❌ Update failed:");
-    console.error(error.message);
+    logError("\n❌ Update failed:");
+    logError(error.message);
 
     if (error.message.includes("Not authorized")) {
-      console.log("\n💡 Make sure you own the agent NFT or have approval");
+      log("\n💡 Make sure you own the agent NFT or have approval");
     }
 
     return false;
@@ -202,29 +234,25 @@ async function main() {
     process.exit(1);
   }
 
-  // Update on both chains
-  const results = {
-    ethereumSepolia: false,
-    baseSepolia: false,
-  };
-
-  // Update Ethereum Sepolia
-  results.ethereumSepolia = await updateURIOnChain("ETHEREUM_SEPOLIA", newCid);
-
-  // Update Base Sepolia
-  results.baseSepolia = await updateURIOnChain("BASE_SEPOLIA", newCid);
+  // Update both chains concurrently - the transactions are independent,
+  // so each chain's confirmation wait overlaps with the other's
+  const [ethereumSepolia, baseSepolia] = await Promise.all([
+    updateURIOnChain("ETHEREUM_SEPOLIA", newCid),
+    updateURIOnChain("BASE_SEPOLIA", newCid),
+  ]);
+  const results = { ethereumSepolia, baseSepolia };
 
   // Summary
   console.log("\n" + "=".repeat(60));
   console.log("📊 Update Summary");
   console.log("=".repeat(60));
   console.log(
-    `Ethereum Sepolia (Agent ID: 961): ${
+    `${NETWORKS.ETHEREUM_SEPOLIA.name} (Agent ID: ${NETWORKS.ETHEREUM_SEPOLIA.agentId}): ${
       results.ethereumSepolia ? "✅ Success" : "❌ Failed"
     }`
   );
   console.log(
-    `Base Sepolia (Agent ID: 56): ${
+    `${NETWORKS.BASE_SEPOLIA.name} (Agent ID: ${NETWORKS.BASE_SEPOLIA.agentId}): ${
       results.baseSepolia ? "✅ Success" : "❌ Failed"
     }`
   );
@@ -234,10 +262,10 @@ async function main() {
     console.log("🎉 All networks updated successfully!\n");
     console.log("🌐 Your agent is now accessible on both chains:");
     console.log(
-      "   • Ethereum Sepolia: eip155:11155111:0x8004A818BFB912233c491871b3d84c89A494BD9e:961"
+      `   • ${NETWORKS.ETHEREUM_SEPOLIA.name}: ${agentReference("ETHEREUM_SEPOLIA")}`
     );
     console.log(
-      "   • Base Sepolia: eip155:84532:0x8004A818BFB912233c491871b3d84c89A494BD9e:56"
+      `   • ${NETWORKS.BASE_SEPOLIA.name}: ${agentReference("BASE_SEPOLIA")}`
     );
     console.log(`\n📦 IPFS Card: ipfs://${newCid}`);
   } else {
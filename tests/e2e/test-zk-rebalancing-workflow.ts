@@ -5,7 +5,16 @@
  * Tests the complete workflow using ZyFI's rebalancer validation rules
  */
 
-import { createPublicClient, createWalletClient, http, parseEther } from "viem";
+import {
+  createPublicClient,
+  createWalletClient,
+  http,
+  webSocket,
+  parseEther,
+  Hash,
+  TransactionReceipt,
+  TransactionReceiptNotFoundError,
+} from "viem";
 import { privateKeyToAccount } from "viem/accounts";
 import { foundry } from "viem/chains";
 import { randomBytes } from "crypto";
@@ -13,11 +22,23 @@ import { execSync } from "child_process";
 import { readFileSync } from "fs";
 import { join } from "path";
 import { RebalancerAgent, ValidatorAgent, ClientAgent } from "../../agents";
+import { getReceiptWaitOptions } from "../../scripts/receipt-wait-options";
+
+// Step banners, built once and reused by every section header
+const SEPARATOR = "─".repeat(70);
+const DOUBLE_SEPARATOR = "=".repeat(70);
+
+// Agents below MIN_AGENT_BALANCE are topped up with FUND_AMOUNT
+const FUND_AMOUNT = parseEther("0.5");
+const MIN_AGENT_BALANCE = parseEther("0.1");
+
+// Same default as viem's waitForTransactionReceipt
+const DEFAULT_RECEIPT_TIMEOUT_MS = 180_000;
 
 async function deployContracts(): Promise<void> {
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
   console.log("STEP 0: Deploy Contracts");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   try {
     // Note: Run `npm run setup:zkp` manually once when circuit changes.
@@ -35,17 +56,78 @@ async function deployContracts(): Promise<void> {
 }
 
 async function testZkRebalancingE2E(): Promise<void> {
-  console.log("\n" + "=".repeat(70));
+  console.log("\n" + DOUBLE_SEPARATOR);
   console.log("  ZK Rebalancer Validation - End-to-End Test");
   console.log("  Using ZyFI Backend Validation Rules");
-  console.log("=".repeat(70) + "\n");
+  console.log(DOUBLE_SEPARATOR + "\n");
 
   const rpcUrl = process.env.RPC_URL || "http://127.0.0.1:8545";
+  // Optional WebSocket endpoint (e.g. ws://127.0.0.1:8545); without it the
+  // batching HTTP transport is used (concurrent reads share one JSON-RPC request)
+  const wsUrl = process.env.WS_URL;
   const publicClient = createPublicClient({
     chain: foundry,
-    transport: http(rpcUrl),
+    transport: wsUrl ? webSocket(wsUrl) : http(rpcUrl, { batch: true }),
   });
 
+  // RECEIPT_TIMEOUT_MS / RECEIPT_POLL_INTERVAL_MS, validated before any tx is sent
+  const receiptWaitOptions = getReceiptWaitOptions();
+
+  // viem's waitForTransactionReceipt polls on a timer even over a WebSocket,
+  // so with WS_URL set, check for the receipt once up front and then again
+  // whenever an eth_subscribe newHeads notification arrives
+  const waitForReceipt = (hash: Hash): Promise<TransactionReceipt> => {
+    if (!wsUrl) {
+      return publicClient.waitForTransactionReceipt({
+        hash,
+        ...receiptWaitOptions,
+      });
+    }
+
+    return new Promise((resolve, reject) => {
+      let settled = false;
+      const settle = (finish: () => void) => {
+        if (settled) {
+          return;
+        }
+        settled = true;
+        clearTimeout(timer);
+        unwatch();
+        finish();
+      };
+
+      const checkReceipt = async () => {
+        try {
+          const receipt = await publicClient.getTransactionReceipt({ hash });
+          settle(() => resolve(receipt));
+        } catch (error) {
+          // Not mined yet: wait for the next head; anything else is a real failure
+          if (!(error instanceof TransactionReceiptNotFoundError)) {
+            settle(() => reject(error));
+          }
+        }
+      };
+
+      const timeoutMs = receiptWaitOptions.timeout ?? DEFAULT_RECEIPT_TIMEOUT_MS;
+      const timer = setTimeout(() => {
+        const error = new Error(
+          `Timed out after ${timeoutMs}ms waiting for receipt of ${hash}`
+        );
+        settle(() => reject(error));
+      }, timeoutMs);
+
+      const unwatch = publicClient.watchBlockNumber({
+        poll: false,
+        onBlockNumber: checkReceipt,
+        onError: (error) => settle(() => reject(error)),
+      });
+
+      // The subscription is set up asynchronously, so a tx mined before it is
+      // active may never be followed by another head (auto-mining Anvil)
+      checkReceipt();
+    });
+  };
+
   console.log("Connected to blockchain\n");
 
   // Deploy contracts
@@ -54,29 +136,33 @@ async function testZkRebalancingE2E(): Promise<void> {
   const timestamp = Date.now();
 
   // Initialize agents
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
   console.log("STEP 1: Initialize Agents");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
+
+  // One draw of key material, sliced into a 32-byte private key per agent
+  const keyMaterial = randomBytes(96);
+  const [rebalancerKey, validatorKey, clientKey] = [0, 32, 64].map(
+    (offset) =>
+      `0x${keyMaterial.subarray(offset, offset + 32).toString("hex")}` as `0x${string}`
+  );
 
   const rebalancer = new RebalancerAgent(
     `rebalancer-${timestamp}.test`,
-    `0x${randomBytes(32).toString("hex")}` as `0x${string}`
+    rebalancerKey
   );
 
   const validator = new ValidatorAgent(
     `validator-${timestamp}.test`,
-    `0x${randomBytes(32).toString("hex")}` as `0x${string}`
+    validatorKey
   );
 
-  const client = new ClientAgent(
-    `client-${timestamp}.test`,
-    `0x${randomBytes(32).toString("hex")}` as `0x${string}`
-  );
+  const client = new ClientAgent(`client-${timestamp}.test`, clientKey);
 
   // Fund agents
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 2: Fund Agents");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   const fundingAccount = privateKeyToAccount(
     "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
@@ -88,32 +174,69 @@ async function testZkRebalancingE2E(): Promise<void> {
     transport: http(rpcUrl),
   });
 
-  for (const agent of [rebalancer, validator, client]) {
-    const balance = await publicClient.getBalance({ address: agent.address });
-    if (balance < parseEther("0.1")) {
+  // Track the funder nonce locally so each send skips eth_getTransactionCount
+  let fundingNonce = await publicClient.getTransactionCount({
+    address: fundingAccount.address,
+    blockTag: "pending",
+  });
+
+  // Fees don't move meaningfully over the few blocks this loop spans, so
+  // estimate once rather than on every send
+  const { maxFeePerGas, maxPriorityFeePerGas } =
+    await publicClient.estimateFeesPerGas();
+
+  // Every funding send is the same plain ETH transfer, so estimate gas on
+  // the first one and reuse it for the rest
+  let transferGas: bigint | undefined;
+
+  const agents = [rebalancer, validator, client];
+  const balances = await Promise.all(
+    agents.map((agent) => publicClient.getBalance({ address: agent.address }))
+  );
+
+  const fundingHashes: Hash[] = [];
+  for (let i = 0; i < agents.length; i++) {
+    if (balances[i] < MIN_AGENT_BALANCE) {
+      transferGas ??= await publicClient.estimateGas({
+        account: fundingAccount,
+        to: agents[i].address,
+        value: FUND_AMOUNT,
+      });
       const hash = await walletClient.sendTransaction({
-        to: agent.address,
-        value: parseEther("0.5"),
+        to: agents[i].address,
+        value: FUND_AMOUNT,
+        gas: transferGas,
+        nonce: fundingNonce++,
+        maxFeePerGas,
+        maxPriorityFeePerGas,
       });
-      await publicClient.waitForTransactionReceipt({ hash });
+      fundingHashes.push(hash);
     }
   }
 
+  // Broadcast everything first, then wait on all receipts together
+  await Promise.all(
+    fundingHashes.map((hash) => waitForReceipt(hash))
+  );
+
   console.log("All agents funded\n");
 
   // Register agents
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
   console.log("STEP 3: Register Agents");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
-  await rebalancer.registerAgent();
-  await validator.registerAgent();
-  await client.registerAgent();
+  // Independent senders, so the three registrations can land in one block
+  await Promise.all([
+    rebalancer.registerAgent(),
+    validator.registerAgent(),
+    client.registerAgent(),
+  ]);
 
   // Load rebalancer validation input data
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 4: Load Rebalancer Validation Input");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   const rebalancerInputPath = join(
     process.cwd(),
@@ -133,9 +256,9 @@ async function testZkRebalancingE2E(): Promise<void> {
   console.log(`   Old APY: ${rebalancerData.oldApy / 10000}%`);
 
   // Generate rebalancer validation proof
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 5: Generate Rebalancer Validation ZK Proof");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   const proof = rebalancer.generateRebalancerValidationProof({
     // New opportunity data
@@ -159,41 +282,35 @@ async function testZkRebalancingE2E(): Promise<void> {
   });
 
   // Submit for validation
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 6: Submit for Validation");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   await rebalancer.requestValidationFromValidator(proof, validator.address);
 
   // Validate
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 7: Validate Proof");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   const validationResult = await validator.validateProof(proof);
 
-  // Submit validation
-  console.log("\n" + "─".repeat(70));
-  console.log("STEP 8: Submit Validation");
-  console.log("─".repeat(70));
+  // Submit validation and generate feedback authorization
+  console.log("\n" + SEPARATOR);
+  console.log("STEPS 8-9: Submit Validation + Generate Feedback Authorization");
+  console.log(SEPARATOR);
 
-  await validator.submitValidation(validationResult);
-
-  // Generate feedback authorization
-  console.log("\n" + "─".repeat(70));
-  console.log("STEP 9: Generate Feedback Authorization");
-  console.log("─".repeat(70));
-
-  const { feedbackAuth } = await rebalancer.generateFeedbackAuthorization(
-    client.address,
-    10n,
-    30
-  );
+  // Validator and rebalancer act independently here, so the validation
+  // response confirms while the feedback authorization is produced
+  const [, { feedbackAuth }] = await Promise.all([
+    validator.submitValidation(validationResult),
+    rebalancer.generateFeedbackAuthorization(client.address, 10n, 30),
+  ]);
 
   // Evaluate and feedback
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 10: Client Feedback");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   const score = client.evaluateRebalancingQuality(proof);
   await client.submitFeedback(
@@ -204,16 +321,16 @@ async function testZkRebalancingE2E(): Promise<void> {
   );
 
   // Check reputation
-  console.log("\n" + "─".repeat(70));
+  console.log("\n" + SEPARATOR);
   console.log("STEP 11: Check Reputation");
-  console.log("─".repeat(70));
+  console.log(SEPARATOR);
 
   client.checkRebalancerReputation(rebalancer.agentId!);
 
   // Summary
-  console.log("\n" + "=".repeat(70));
+  console.log("\n" + DOUBLE_SEPARATOR);
   console.log("  REBALANCER VALIDATION TEST COMPLETE");
-  console.log("=".repeat(70));
+  console.log(DOUBLE_SEPARATOR);
   console.log("\nAll steps executed successfully!");
   console.log(
     "  • Rebalancer validation input loaded from input/rebalancer-input.json"
@@ -227,7 +344,7 @@ async function testZkRebalancingE2E(): Promise<void> {
   console.log("  • Proof validated on-chain");
   console.log("  • Agents registered and coordinated");
   console.log("  • Feedback and reputation tracked");
-  console.log("\n" + "=".repeat(70) + "\n");
+  console.log("\n" + DOUBLE_SEPARATOR + "\n");
 }
 
 if (require.main === module) {
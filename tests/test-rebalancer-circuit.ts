@@ -10,8 +10,14 @@
 
 import * as fs from "fs";
 import * as path from "path";
-import { groth16 } from "snarkjs";
-import { createPublicClient, http, formatUnits } from "viem";
+import { groth16, wtns } from "snarkjs";
+import {
+  createPublicClient,
+  http,
+  formatUnits,
+  HttpTransport,
+  PublicClient,
+} from "viem";
 import { foundry } from "viem/chains";
 
 interface TestCase {
@@ -50,29 +56,97 @@ interface TestResults {
   }>;
 }
 
-async function generateProof(input: TestCase["input"]): Promise<{
+// RebalancerVerifier ABI (parsed once, shared by every test case)
+const REBALANCER_VERIFIER_ABI = [
+  {
+    inputs: [
+      {
+        internalType: "uint256[2]",
+        name: "_pA",
+        type: "uint256[2]",
+      },
+      {
+        internalType: "uint256[2][2]",
+        name: "_pB",
+        type: "uint256[2][2]",
+      },
+      {
+        internalType: "uint256[2]",
+        name: "_pC",
+        type: "uint256[2]",
+      },
+      {
+        internalType: "uint256[15]",
+        name: "_pubSignals",
+        type: "uint256[15]",
+      },
+    ],
+    name: "verifyProof",
+    outputs: [
+      {
+        internalType: "bool",
+        name: "",
+        type: "bool",
+      },
+    ],
+    stateMutability: "view",
+    type: "function",
+  },
+] as const;
+
+const BUILD_DIR = path.join(process.cwd(), "build", "rebalancer-validation");
+const WASM_PATH = path.join(
+  BUILD_DIR,
+  "rebalancer-validation_js",
+  "rebalancer-validation.wasm"
+);
+const ZKEY_PATH = path.join(BUILD_DIR, "rebalancer_validation_final.zkey");
+
+interface CircuitArtifacts {
+  wasm: Uint8Array;
+  zkey: Uint8Array;
+}
+
+// Read the wasm and zkey once; snarkjs accepts the buffers directly, so each
+// test case proves from memory instead of re-reading the files
+function loadCircuitArtifacts(): CircuitArtifacts {
+  if (!fs.existsSync(WASM_PATH) || !fs.existsSync(ZKEY_PATH)) {
+    throw new Error(`ZK artifacts not found. Run: npm run setup:zkp:rebalancer`);
+  }
+
+  return {
+    wasm: fs.readFileSync(WASM_PATH),
+    zkey: fs.readFileSync(ZKEY_PATH),
+  };
+}
+
+// Witness calculation runs on the main thread while groth16.prove spends most
+// of its time in ffjavascript worker threads, so the next test case's witness
+// is computed while the current one is being proved
+async function calculateWitness(
+  input: TestCase["input"],
+  artifacts: CircuitArtifacts
+): Promise<Uint8Array | null> {
+  try {
+    const witness: { type: "mem"; data?: Uint8Array } = { type: "mem" };
+    await wtns.calculate(input, artifacts.wasm, witness as any);
+    return witness.data ?? null;
+  } catch (error: any) {
+    return null;
+  }
+}
+
+async function generateProof(
+  witness: Uint8Array,
+  artifacts: CircuitArtifacts
+): Promise<{
   proof: any;
   publicSignals: string[];
 } | null> {
   try {
-    const buildDir = path.join(process.cwd(), "build", "rebalancer-validation");
-    const wasmPath = path.join(
-      buildDir,
-      "rebalancer-validation_js",
-      "rebalancer-validation.wasm"
-    );
-    const zkeyPath = path.join(buildDir, "rebalancer_validation_final.zkey");
-
-    if (!fs.existsSync(wasmPath) || !fs.existsSync(zkeyPath)) {
-      throw new Error(
-        `ZK artifacts not found. Run: npm run setup:zkp:rebalancer`
-      );
-    }
-
-    const { proof, publicSignals } = await groth16.fullProve(
-      input,
-      wasmPath,
-      zkeyPath
+    const { proof, publicSignals } = await groth16.prove(
+      artifacts.zkey,
+      witness
     );
 
     return { proof, publicSignals };
@@ -82,56 +156,12 @@ async function generateProof(input: TestCase["input"]): Promise<{
 }
 
 async function verifyProofOnChain(
+  publicClient: PublicClient<HttpTransport, typeof foundry>,
   proof: any,
   publicSignals: string[],
-  verifierAddress: string,
-  rpcUrl: string
+  verifierAddress: string
 ): Promise<boolean> {
   try {
-    // Create public client
-    const publicClient = createPublicClient({
-      chain: foundry,
-      transport: http(rpcUrl),
-    });
-
-    // RebalancerVerifier ABI
-    const verifierAbi = [
-      {
-        inputs: [
-          {
-            internalType: "uint256[2]",
-            name: "_pA",
-            type: "uint256[2]",
-          },
-          {
-            internalType: "uint256[2][2]",
-            name: "_pB",
-            type: "uint256[2][2]",
-          },
-          {
-            internalType: "uint256[2]",
-            name: "_pC",
-            type: "uint256[2]",
-          },
-          {
-            internalType: "uint256[15]",
-            name: "_pubSignals",
-            type: "uint256[15]",
-          },
-        ],
-        name: "verifyProof",
-        outputs: [
-          {
-            internalType: "bool",
-            name: "",
-            type: "bool",
-          },
-        ],
-        stateMutability: "view",
-        type: "function",
-      },
-    ] as const;
-
     // Format proof for Solidity
     const pA: [bigint, bigint] = [BigInt(proof.pi_a[0]), BigInt(proof.pi_a[1])];
     const pB: [[bigint, bigint], [bigint, bigint]] = [
@@ -162,7 +192,7 @@ async function verifyProofOnChain(
     // Verify proof
     const isValid = await publicClient.readContract({
       address: verifierAddress as `0x${string}`,
-      abi: verifierAbi,
+      abi: REBALANCER_VERIFIER_ABI,
       functionName: "verifyProof",
       args: [pA, pB, pC, pubSignals],
     });
@@ -187,6 +217,8 @@ async function runTestCases(): Promise<void> {
   const testCasesData = JSON.parse(fs.readFileSync(testCasesPath, "utf-8"));
   const testCases: TestCase[] = testCasesData.testCases;
 
+  const artifacts = loadCircuitArtifacts();
+
   const results: TestResults = {
     total: testCases.length,
     passed: 0,
@@ -199,14 +231,16 @@ async function runTestCases(): Promise<void> {
   const rpcUrl = process.env.RPC_URL || "http://localhost:8545";
   let useOnChainVerification = false;
 
+  // Single client (and HTTP connection pool) shared by every test case
+  const publicClient = createPublicClient({
+    chain: foundry,
+    transport: http(rpcUrl),
+  });
+
   if (verifierAddress) {
     try {
       // Test connection
-      const testClient = createPublicClient({
-        chain: foundry,
-        transport: http(rpcUrl),
-      });
-      await testClient.getBlockNumber();
+      await publicClient.getBlockNumber();
       useOnChainVerification = true;
       console.log(`📡 Using on-chain verification at: ${verifierAddress}`);
       console.log(`🔗 RPC URL: ${rpcUrl}\n`);
@@ -222,6 +256,11 @@ async function runTestCases(): Promise<void> {
   }
 
   // Run each test case
+  let nextWitness =
+    testCases.length > 0
+      ? calculateWitness(testCases[0].input, artifacts)
+      : Promise.resolve(null);
+
   for (let i = 0; i < testCases.length; i++) {
     const testCase = testCases[i];
     console.log(`\n[${i + 1}/${testCases.length}] ${testCase.name}`);
@@ -229,8 +268,14 @@ async function runTestCases(): Promise<void> {
     console.log(`   Expected: ${testCase.expectedResult}`);
 
     try {
-      // Generate proof
-      const proofResult = await generateProof(testCase.input);
+      // Generate proof, starting the next case's witness before proving
+      const witness = await nextWitness;
+      if (i + 1 < testCases.length) {
+        nextWitness = calculateWitness(testCases[i + 1].input, artifacts);
+      }
+      const proofResult = witness
+        ? await generateProof(witness, artifacts)
+        : null;
 
       if (!proofResult) {
         // Proof generation failed
@@ -264,10 +309,10 @@ async function runTestCases(): Promise<void> {
       // Verify on-chain if enabled
       if (useOnChainVerification && verifierAddress) {
         const isValid = await verifyProofOnChain(
+          publicClient,
           proof,
           publicSignals,
-          verifierAddress,
-          rpcUrl
+          verifierAddress
         );
 
         if (isValid && testCase.expectedResult === "PASS") {